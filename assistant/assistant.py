@@ -1,4 +1,5 @@
 import logging
+import sys
 
 # Local modules
 import config
@@ -8,6 +9,23 @@ logger = logging.getLogger('Assistant')
 """Configure the default logger for the module."""
 
 
+_LEVELS = {
+    'info': logging.INFO,
+    'warn': logging.WARN,
+    'error': logging.ERROR,
+    'debug': logging.DEBUG,
+}
+"""Logging levels for each of the log_level configuration values."""
+
+
+_MODES = {
+    'append': 'a',
+    'truncate': 'w',
+    'rotate': 'a',              # not implemented, treated as append
+}
+"""Logfile open modes for each of the log_mode configuration values."""
+
+
 def initalise_logging(log_level: int = None) -> None:
     """Initialise the logger at the provided logging level.
     
@@ -28,44 +46,34 @@ def initalise_logging(log_level: int = None) -> None:
         set_level = log_level        
     else:
         try:
-            set_level = logging.WARN           # default level
-            match config.get_value('log_level'):
-                case 'info':
-                    set_level = logging.INFO
-                case 'warn':
-                    set_level = logging.WARN
-                case 'error':
-                    set_level = logging.ERROR
-                case 'debug':
-                    set_level = logging.DEBUG
-                case _:
-                    logger.error(
-                        'Invalid logging configuration: log_level: %s',
-                        config.get_value('log_level')
-                    )
-        except:
-            pass
-        
+            config_level = config.get_value('log_level')
+        except ValueError:
+            config_level = 'warn'               # default level
+
+        if config_level not in _LEVELS:
+            logger.error(
+                'Invalid logging configuration: log_level: %s',
+                config_level
+            )
+        set_level = _LEVELS.get(config_level, logging.WARN)
+
     try:
-        set_mode = 'a'                          # default mode
-        match config.get_value('log_mode'):
-            case 'append':
-                set_mode = 'a'
-            case 'truncate':
-                set_mode = 'w'
-            case 'rotate':
-                logger.info('Logger mode "rotate" not implemented.')
-            case _:
-                logger.error(
-                    'Invalid logging configuration: log_mode: %s',
-                    config.get_value('log_mode')
-                )
-    except:
-        pass
+        config_mode = config.get_value('log_mode')
+    except ValueError:
+        config_mode = 'append'                  # default mode
+
+    if config_mode not in _MODES:
+        logger.error(
+            'Invalid logging configuration: log_mode: %s',
+            config_mode
+        )
+    elif config_mode == 'rotate':
+        logger.info('Logger mode "rotate" not implemented.')
+    set_mode = _MODES.get(config_mode, 'a')
 
     try:
         set_filename = config.get_value('logfile')
-    except:
+    except ValueError:
         set_filename = 'assistant.log'          # default logfile name
 
     logging.basicConfig(
@@ -75,18 +83,65 @@ def initalise_logging(log_level: int = None) -> None:
     )
 
 
+def _read_prompt(prompt: str) -> str:
+    """Display the prompt and read a line of user input.
+
+    A lighter weight replacement for input(), writing the prompt and
+    reading the reply directly through the sys.stdout and sys.stdin
+    streams. The output is only flushed when a prompt is displayed.
+
+    Parameters
+    ----------
+    prompt
+        The prompt string to display to the user.
+
+    Returns
+    -------
+    str
+        The line entered without its trailing newline.
+
+    Raises
+    ------
+    EOFError
+        The end of the input stream was reached.
+    """
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
 def run_assistant():
-    conv = conversation.Conversation('openai')
+    # The conversation (and LangChain) is only initialised once there is
+    # a prompt for it to process.
+    conv = None
+
+    def reset_conversation():
+        if conv is not None:
+            conv.reset()
+
+    # Assistant commands, returning True if the Assistant is to exit. Any
+    # other input is passed to the conversation as a prompt.
+    commands = {
+        'quit': lambda: True,
+        'reset': reset_conversation,
+    }
+
     prompt = "Assistant> "
     while True:
-        message = input(prompt)
-        if message is not None and message != '':
-            match message:
-                case 'quit':
-                    return
-                case _:
-                    response = conv.run_prompt(message)
-                    print(response['output'])
+        message = _read_prompt(prompt)
+        if message:
+            command = commands.get(message)
+            if command is None:
+                if conv is None:
+                    conv = conversation.Conversation('openai')
+                response = conv.run_prompt(message)
+                print(response['output'])
+            elif command():
+                return
 
 
 if __name__ == "__main__":
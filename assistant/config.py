@@ -24,21 +24,227 @@ This global configuration can be imported into any module requiring module
 configuration details. If a module is using configuration values from this
 module, please ensure that the above specification is updated to include
 expected YAML schema.
+
+A parsed configuration file is also written to a JSON sidecar file
+(<filename>.cache.json) next to it, which is loaded in preference to the
+YAML file while the YAML file's modification time and size match those
+recorded in the cache. Configuration that JSON can't represent exactly
+(such as non-string keys) is not cached. As it holds the same private
+tokens it is created readable by the owner only.
 """
+import functools
+import json
 import logging
 import os
+import sys
+import tempfile
 import yaml
 import copy
+from types import MappingProxyType
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+"""YAML loader, using the libyaml C extension when it is available."""
+
+
+_DEFAULTS = {
+    'log_level': 'warn',
+}
+"""Default configuration values, loaded configuration is merged over."""
 
 
-_assistant_config = None
+_assistant_config = copy.deepcopy(_DEFAULTS)
 """Global configuration data for the Assistant."""
 
 
+_frozen_config = None
+"""Read-only view of _assistant_config used for value lookups."""
+
+
+_config_gen = 0
+"""Generation of the global configuration, incremented by each load()."""
+
+
+_parse_cache = {}
+"""Parsed configuration files keyed by (path, mtime, size)."""
+
+
+_key_paths = {}
+"""Dot separated keys split into tuples of interned key components."""
+
+
+_JSON_CACHE_VERSION = 2
+"""Format version of the JSON sidecar cache files."""
+
+
 logger = logging.getLogger(__name__)
 """Configure the default logger for the module."""
 
 
+def _freeze(value: object) -> object:
+    """Return a read-only equivalent of a parsed configuration value.
+
+    Dictonaries are wrapped in a MappingProxyType and lists converted to
+    tuples, recursively, so that the configuration tree can be handed out
+    to callers without being copied. Dictonary keys are interned so that
+    lookups with the interned key paths compare by identity.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({
+            sys.intern(k) if isinstance(k, str) else k: _freeze(v)
+            for k, v in value.items()
+        })
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _deep_update(dst: dict, src: dict) -> None:
+    """Merge the nested dictonary src into dst.
+
+    Values within src replace those in dst, except where both are
+    dictonaries in which case they are merged. An explicit stack is used
+    rather than recursion.
+    """
+    stack = [(dst, src)]
+    while stack:
+        d, s = stack.pop()
+        for k, v in s.items():
+            if isinstance(v, dict) and isinstance(d.get(k), dict):
+                stack.append((d[k], v))
+            else:
+                d[k] = v
+
+
+def _key_path(key: str) -> tuple:
+    """Split a dot separated key into its interned components.
+
+    Keys are split only once, with the result reused by every later
+    lookup of the same key.
+    """
+    path = _key_paths.get(key)
+    if path is None:
+        path = _key_paths.setdefault(
+            key,
+            tuple(sys.intern(k) for k in key.split('.')),
+        )
+    return path
+
+
+def _read_json_cache(filename: str, yaml_stat: os.stat_result) -> dict:
+    """Read the JSON sidecar cache of a configuration file.
+
+    Parameters
+    ----------
+    filename
+        Name of the JSON cache file.
+    yaml_stat
+        Status of the YAML file, which must have the modification time (ns)
+        and size recorded within the cache.
+
+    Returns
+    -------
+    dict
+        Cached configuration data, or None if the cache is missing, stale,
+        unreadable or of a different format version.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (not isinstance(cache, dict)
+            or cache.get('version') != _JSON_CACHE_VERSION
+            or cache.get('mtime_ns') != yaml_stat.st_mtime_ns
+            or cache.get('size') != yaml_stat.st_size):
+        return None
+    return cache.get('config')
+
+
+def _write_json_cache(
+        filename: str,
+        yaml_stat: os.stat_result,
+        config_data: dict,
+    ) -> None:
+    """Atomically write configuration data to a JSON sidecar cache file.
+
+    Failure to write the cache is not an error, the YAML file is simply
+    parsed again on the next load. Configuration data that doesn't survive
+    conversion to JSON unchanged is not cached.
+
+    Parameters
+    ----------
+    filename
+        Name of the JSON cache file.
+    yaml_stat
+        Status of the YAML file the configuration data was parsed from.
+    config_data
+        Parsed configuration data to be cached.
+    """
+    try:
+        if json.loads(json.dumps(config_data)) != config_data:
+            logger.debug('Configuration not cached, not representable as JSON')
+            return
+    except (TypeError, ValueError):
+        return
+
+    cache = {
+        'version': _JSON_CACHE_VERSION,
+        'mtime_ns': yaml_stat.st_mtime_ns,
+        'size': yaml_stat.st_size,
+        'config': config_data,
+    }
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            dir = os.path.dirname(os.path.abspath(filename)),
+            suffix = '.tmp',
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_name, filename)
+        except:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, TypeError, ValueError) as err:
+        logger.debug('Unable to write configuration cache %s: %s', filename, err)
+
+
+def _parse_file(filename: str) -> dict:
+    """Parse a YAML configuration file, reusing a cached parse if unchanged.
+
+    The file is only read and parsed when its path, modification time or
+    size differ from a previous parse, otherwise a copy of the previously
+    parsed data is returned. A current JSON sidecar cache is used instead
+    of parsing the YAML, and is (re)written after the YAML is parsed.
+
+    Parameters
+    ----------
+    filename
+        Name of the YAML file to parse.
+
+    Returns
+    -------
+    dict
+        Parsed configuration data (None for an empty file).
+    """
+    st = os.stat(filename)
+    key = (os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+    if key not in _parse_cache:
+        cache_file = filename + '.cache.json'
+        config_data = _read_json_cache(cache_file, st)
+        if config_data is None:
+            with open(filename, 'rb') as f:
+                config_data = yaml.load(f, Loader=_YamlLoader)
+            if config_data is not None:
+                _write_json_cache(cache_file, st, config_data)
+        _parse_cache[key] = config_data
+    return copy.deepcopy(_parse_cache[key])
+
+
 def load(config_file: str = None) -> str:
     """Load Assistant configuration data from file or standard locations.
     
@@ -49,7 +255,8 @@ def load(config_file: str = None) -> str:
 
     Configuration information is loaded into the global assistant_config
     structure and new configuration loaded is merged with any existing
-    configuration stored.
+    configuration stored. Nested configuration groups are merged, so a
+    group only partially specified retains its other existing values.
 
     Patameters
     ----------
@@ -61,15 +268,9 @@ def load(config_file: str = None) -> str:
     str
         None value if successfully loaded, otherwise a error message.
     """
-    global _assistant_config
+    global _frozen_config, _config_gen
     config_yaml = None
 
-    # If not initalised, set default values.
-    if _assistant_config is None:
-        _assistant_config = {
-            'log_level': 'warn',
-        }
-
     # default config file locations (currently only local dir).
     config_dirs = [
         '.',
@@ -81,14 +282,19 @@ def load(config_file: str = None) -> str:
                 filename = config_dir + "/assistant.yaml"
 
                 if os.path.isfile(filename):
-                    config_yaml = yaml.safe_load(open(filename, 'r'))
+                    config_yaml = _parse_file(filename)
         else:
             filename = config_file
             if os.path.isfile(filename):
-                config_yaml = yaml.safe_load(open(filename, 'r'))
+                config_yaml = _parse_file(filename)
 
         if config_yaml is not None:            
-            _assistant_config.update(config_yaml)
+            _deep_update(_assistant_config, config_yaml)
+
+        # publish a frozen copy and invalidate memoized lookups of the
+        # previous configuration
+        _frozen_config = _freeze(_assistant_config)
+        _config_gen += 1
 
         return None
     
@@ -133,11 +339,17 @@ def check_value(key: str) -> bool:
     bool
         True if the key exists, otherwise False.
     """
-    if _assistant_config is None:
+    return _check_value_cached(_config_gen, key)
+
+
+@functools.lru_cache(maxsize=256)
+def _check_value_cached(gen: int, key: str) -> bool:
+    """Memoized check_value() for a configuration generation."""
+    if _frozen_config is None:
         return False
     
-    key_dict = _assistant_config
-    for k in key.split('.'):
+    key_dict = _frozen_config
+    for k in _key_path(key):
         if k in key_dict:
             key_dict = key_dict[k]
         else:
@@ -182,28 +394,32 @@ def get_value(key: str) -> str | dict:
     -------
     object
         Configuration stored at the key location, either a specific value
-        or dictonary structure depending on key contents.
+        or a read-only dictonary view depending on key contents. Callers
+        requiring a mutable copy must convert it with dict().
 
     Raises
     ------
     ValueError
         The configuration key was not found.
     """
-    if _assistant_config is None:
+    return _get_value_cached(_config_gen, key)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_value_cached(gen: int, key: str) -> str | MappingProxyType:
+    """Memoized get_value() for a configuration generation."""
+    if _frozen_config is None:
         logger.error('No configuration has been loaded!')
         raise ValueError
     
-    key_dict = _assistant_config
-    for k in key.split('.'):
+    key_dict = _frozen_config
+    for k in _key_path(key):
         if k in key_dict:
             key_dict = key_dict[k]
         else:
             logger.error('Key "%s" not set in configuration [%s]', key, k)
             logger.debug(_assistant_config)
             raise ValueError
-    if isinstance(key_dict, dict):
-        return copy.deepcopy(key_dict)
-    else:
-        return key_dict
+    return key_dict
         
 
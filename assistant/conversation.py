@@ -5,39 +5,69 @@ to maintain an interactive conversation between the user and the LLM. This
 includes memory of the current conversation, the LLM itself and all the
 required Tools and resources.
 """
+import hashlib
 import logging
-
-from langchain.chains.conversation.memory import ConversationBufferWindowMemory
-from langchain.schema import BaseOutputParser
-from langchain.agents import initialize_agent
-from langchain.agents.agent_types import AgentType
+import textwrap
+from types import MappingProxyType
 
 import config
-import probes.controller
-import models.model as Model
 
 
 logger = logging.getLogger(__name__)
 """Configure the default logger for the module."""
 
 
-# The Assistant system prompt that the Agent is initialised with.
-_system_prompt = """
+# The Assistant system prompt that the Agent is initialised with. This
+# forms the start of every prompt sent to the LLM, so it is normalised to
+# keep it byte identical (and cacheable by the LLM provider) between runs.
+_system_prompt = textwrap.dedent("""
     You are a expert technical Assistant designed to be able to assist with a wide range of IT tasks.
     Assistant is constantly learning and improving, and its capabilities are constantly evolving. It is able to process and understand large amounts of text, and can use this knowledge to provide accurate and informative responses to a wide range of questions.
     Additionally, Assistant is able to generate its own text based on the input it receives, allowing it to engage in discussions and provide explanations and descriptions on a wide range of IT topics.
-    """
+    """).strip()
+
+# Hash of the system prompt, logged so that any change to it can be seen.
+_system_prompt_hash = hashlib.sha256(_system_prompt.encode()).hexdigest()
+
+# Keyword arguments for the Agent, these never change so are only created
+# once (read-only to catch any accidental modification).
+_agent_kwargs = MappingProxyType({
+    'system_message': _system_prompt,
+})
 
-class AssistantOutputParser(BaseOutputParser):
-    """Parse the output of an LLM call to a comma-separated list."""
 
-    def parse(self, text: str):
-        """Parse the output of an LLM call."""
-        return text.strip().split(", ")
+# Accepted LangChain Agent early stopping methods, the first is the default.
+_early_stopping_methods = ('force', 'generate')
+
+
+def _as_bool(value) -> bool:
+    """Interpret a configuration value as a boolean.
+
+    YAML will provide a bool for unquoted true/false values, however a
+    quoted value such as 'False' is a string which would be truthy.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', 'on', '1')
+    return bool(value)
 
 
 class Conversation:
 
+    __slots__ = ('_llm', '_conv_memory', '_agent')
+
+    # LangChain and the modules that depend upon it are slow to import, so
+    # they are only imported when the first conversation is created and are
+    # then kept here for use by any further conversations.
+    _WindowMemory = None
+    _initialize_agent = None
+    _AgentType = None
+    _Model = None
+    _probe_controller = None
+
+    # Constructed LLM and Agent instances keyed by the configuration they
+    # were constructed from, see _agent_key().
+    _agent_cache = {}
+
     def __init__(self, model_name: str) -> None:
         """Initalise a new conversation and prepare the LLM.
         
@@ -50,45 +80,169 @@ class Conversation:
         model
             The name of the LLM to use for the conversation.
         """
-        global _system_prompt
-        
+        self._import_langchain()
+
         try:
             lc_config = config.get_value('langchain')
         except ValueError:
             logger.critical('Missing LangChain configuration!')
             quit()
 
-        # Configure the requested LLM
-        match model_name:
-            case 'openai' :
-                self._llm = Model.openai()
-            case _:
-                logger.critical('Unknown LLM: %s', model_name)
-                return
-        
+        # The Agent is shared by all conversations with the same
+        # configuration, only the conversational memory is their own.
+        agents = self._get_agent(model_name, lc_config)
+        if agents is None:
+            return
+        self._llm, agent = agents
+
         # Initalise conversational memory
-        self._conv_memory = ConversationBufferWindowMemory(
+        self._conv_memory = self._WindowMemory(
             memory_key = 'chat_history',
             k = int(lc_config.get('memory', '5')),
             return_messages = True,
+            llm = self._llm,
+            max_token_limit = (
+                int(lc_config['memory_tokens'])
+                if lc_config.get('memory_tokens') is not None else None
+            ),
         )
 
+        # Bind the memory onto a (shallow) copy of the shared Agent
+        self._agent = agent.copy(update={'memory': self._conv_memory})
+
+
+    @classmethod
+    def _get_agent(cls, model_name: str, lc_config: dict) -> tuple:
+        """Return the LLM and Agent for the model, constructing if required.
+
+        Constructing the Agent is expensive, so the LLM and Agent are
+        constructed once for each configuration and then reused by all
+        conversations using that configuration. The Agent is constructed
+        without memory, which each conversation provides for itself.
+
+        Parameters
+        ----------
+        model_name
+            The name of the LLM to use for the conversation.
+        lc_config
+            The LangChain configuration the Agent is constructed with.
+
+        Returns
+        -------
+        tuple
+            The LLM and Agent, or None if the model is unknown.
+        """
+        agent_key = cls._agent_key(model_name, lc_config)
+        if agent_key in cls._agent_cache:
+            return cls._agent_cache[agent_key]
+
+        # Configure the requested LLM
+        match model_name:
+            case 'openai' :
+                llm = cls._Model.openai()
+            case _:
+                logger.critical('Unknown LLM: %s', model_name)
+                return None
+
+        # An invalid early stopping method is only rejected by LangChain
+        # when the Agent is stopped, so check it up front.
+        early_stopping = lc_config.get('early_stopping', _early_stopping_methods[0])
+        if early_stopping not in _early_stopping_methods:
+            logger.error(
+                'Invalid LangChain early_stopping "%s", using "%s"',
+                early_stopping,
+                _early_stopping_methods[0],
+            )
+            early_stopping = _early_stopping_methods[0]
+
         # Register the Agent??? Possibly need a Chain???
-        self._agent = initialize_agent(
-#            agent = AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
-            agent = AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
-            agent_kwargs = {'system_message': _system_prompt},
-            tools = probes.controller.tool_list(),
-            llm = self._llm,
-            verbose = lc_config.get('verbose', False),
+        agent = cls._initialize_agent(
+#            agent = cls._AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
+            agent = cls._AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
+            agent_kwargs = _agent_kwargs,
+            tools = cls._probe_controller.tool_list(),
+            llm = llm,
+            verbose = _as_bool(lc_config.get('verbose', False)),
             max_iterations = int(lc_config.get('max_iterations', '3')),
-            early_stopping_method = 'generate',
-            memory = self._conv_memory,
+            max_execution_time = float(lc_config.get('max_execution_time', '60')),
+            early_stopping_method = early_stopping,
+        )
+        cls._agent_cache[agent_key] = (llm, agent)
+        logger.info('Agent system prompt sha256: %s', _system_prompt_hash)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initalised Model: %s\n%s", model_name, agent)
+        return cls._agent_cache[agent_key]
+
+
+    @staticmethod
+    def _agent_key(model_name: str, lc_config: dict) -> tuple:
+        """Generate the Agent cache key for the current configuration.
+
+        The API token is included as a hash so that it isn't held in
+        memory any more than it already is.
+
+        Parameters
+        ----------
+        model_name
+            The name of the LLM used for the conversation.
+        lc_config
+            The LangChain configuration the Agent is constructed with.
+
+        Returns
+        -------
+        tuple
+            Key identifying the LLM and Agent configuration.
+        """
+        try:
+            model_config = config.get_value(model_name)
+        except ValueError:
+            model_config = {}
+
+        token = str(model_config.get('token', ''))
+        return (
+            model_name,
+            hashlib.sha1(token.encode()).hexdigest(),
+            model_config.get('model'),
+            model_config.get('temperature'),
+            repr(sorted(lc_config.items())),
         )
-        logger.debug("Initalised Model: %s\n%s", model_name, self._agent)
-      
+
+
+    @classmethod
+    def _import_langchain(cls) -> None:
+        """Import LangChain and the modules that depend upon it.
+
+        The imported objects are stored on the class, so only the first
+        conversation created pays the cost of the imports.
+        """
+        if cls._initialize_agent is not None:
+            return
+
+        from langchain.agents import initialize_agent
+        from langchain.agents.agent_types import AgentType
+
+        import memory
+        import probes.controller
+        import models.model as Model
+
+        cls._WindowMemory = memory.WindowMemory
+        cls._AgentType = AgentType
+        cls._Model = Model
+        cls._probe_controller = probes.controller
+        cls._initialize_agent = staticmethod(initialize_agent)
+
+
+    def reset(self) -> None:
+        """Clear the conversational memory to start a new conversation."""
+        self._conv_memory.clear()
+
 
     def run_prompt(self, prompt: str):
         """Process the provided user prompt string."""
         return self._agent(prompt)
 
+
+    async def arun_prompt(self, prompt: str):
+        """Process the provided user prompt string asynchronously."""
+        return await self._agent.acall(prompt)
+
@@ -1,6 +1,41 @@
 import mysql.connector
+import mysql.connector.pooling
+
+# Connection pools shared by all MySQL instances, keyed by the connection
+# details so that each database only has its connections established once.
+_POOL_SIZE = 5
+_pools = {}
+
+
+def _get_pool(user, password, host, database):
+    """Return the connection pool for the database, creating it if required."""
+    key = (user, password, host, database)
+    if key not in _pools:
+        _pools[key] = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name = f'aiops-{len(_pools)}',
+            pool_size = _POOL_SIZE,
+            user = user,
+            password = password,
+            host = host,
+            database = database,
+        )
+    return _pools[key]
+
 
 class MySQL:
+    """Connection to a MySQL database, checked out of a connection pool.
+
+    Each instance holds one of the _POOL_SIZE pooled connections for its
+    database until it is released. Once they are all held, creating a
+    further instance raises a PoolError. Callers must release the
+    connection by calling close() or by using the instance as a context
+    manager:
+
+        with MySQL(user, password, host, database) as db:
+            db.ping_db()
+
+    The connection is also released if the instance is garbage collected.
+    """
 
     def __init__(self, user, password, host, database):
 
@@ -10,12 +45,33 @@ class MySQL:
         self.host = host
         self.database = database
 
-        self.db_conn = mysql.connector.connect(
-            user = self.user,
-            password = self.password,
-            host = self.host,
-            database = self.database
-        )
+        # checkout a pooled connection rather than connecting each time
+        self.db_conn = _get_pool(
+            self.user,
+            self.password,
+            self.host,
+            self.database,
+        ).get_connection()
 
     def ping_db(self):
-        return True
\ No newline at end of file
+        """Check the database connection, reconnecting if it was dropped."""
+        try:
+            self.db_conn.ping(reconnect=True, attempts=2, delay=0)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def close(self):
+        """Return the connection to the connection pool."""
+        if getattr(self, 'db_conn', None) is not None:
+            self.db_conn.close()
+            self.db_conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
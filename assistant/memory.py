@@ -0,0 +1,115 @@
+"""Conversational memory for the Assistant Agent.
+
+LangChain's ConversationBufferWindowMemory keeps the full history of a
+conversation and slices the last k exchanges out of it each time the
+memory is read. The WindowMemory class provided here instead holds only
+the last k exchanges within a fixed length ring buffer, so old messages
+are dropped as new ones are saved and reading the memory only has to copy
+the messages within the window.
+
+The window can also be bounded by a number of tokens, as measured by the
+LLM, in which case the oldest exchanges are dropped until the remembered
+messages fit within the limit. This keeps the size of the prompts sent to
+the LLM bounded no matter how long the conversation is.
+"""
+import logging
+from collections import deque
+from typing import Any, Optional
+
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.schema import AIMessage, HumanMessage, get_buffer_string
+
+try:
+    from langchain.pydantic_v1 import PrivateAttr
+except ImportError:
+    from pydantic import PrivateAttr
+"""PrivateAttr from the pydantic namespace LangChain builds its models on."""
+
+logger = logging.getLogger(__name__)
+"""Configure the default logger for the module."""
+
+
+class WindowMemory(BaseChatMemory):
+    """Memory of the last k exchanges of a conversation.
+
+    Parameters
+    ----------
+    memory_key
+        Prompt variable name the memory is provided to the Agent as.
+    k
+        Number of previous prompt and response exchanges to remember.
+    return_messages
+        Provide the memory as a list of messages rather than a string.
+    llm
+        The LLM used to count the tokens of the remembered messages.
+    max_token_limit
+        Maximum number of tokens remembered, None for no limit.
+    """
+    human_prefix: str = 'Human'
+    ai_prefix: str = 'AI'
+    memory_key: str = 'history'
+    k: int = 5
+    llm: Any = None
+    max_token_limit: Optional[int] = None
+
+    _window: deque = PrivateAttr(default_factory=deque)
+    _count_tokens: bool = PrivateAttr(default=True)
+
+
+    def __init__(self, **kwargs) -> None:
+        """Initalise the memory with a ring buffer of 2k messages."""
+        super().__init__(**kwargs)
+        self._window = deque(maxlen=max(self.k, 0) * 2)
+
+
+    @property
+    def memory_variables(self) -> list:
+        """The prompt variables provided by the memory."""
+        return [self.memory_key]
+
+
+    def load_memory_variables(self, inputs: dict) -> dict:
+        """Provide the remembered messages for the next prompt."""
+        if self.return_messages:
+            return {self.memory_key: list(self._window)}
+
+        return {
+            self.memory_key: get_buffer_string(
+                self._window,
+                human_prefix = self.human_prefix,
+                ai_prefix = self.ai_prefix,
+            )
+        }
+
+
+    def save_context(self, inputs: dict, outputs: dict) -> None:
+        """Remember the prompt and response of an exchange."""
+        input_str, output_str = self._get_input_output(inputs, outputs)
+        self._window.append(HumanMessage(content=input_str))
+        self._window.append(AIMessage(content=output_str))
+
+        # Drop the oldest exchanges until within the token limit, always
+        # keeping the latest exchange.
+        if (self.max_token_limit is not None and self.llm is not None
+                and self._count_tokens):
+            try:
+                while (len(self._window) > 2
+                        and self.llm.get_num_tokens_from_messages(list(self._window))
+                            > self.max_token_limit):
+                    self._window.popleft()
+                    self._window.popleft()
+            except Exception as err:
+                # Counting tokens can need packages that aren't installed
+                # (ChatOpenAI requires tiktoken), so fall back to only
+                # limiting the memory to the last k exchanges.
+                logger.error(
+                    'Unable to count memory tokens, limiting memory to %i exchanges: %s',
+                    self.k,
+                    err,
+                )
+                self._count_tokens = False
+
+
+    def clear(self) -> None:
+        """Forget all remembered exchanges."""
+        self._window.clear()
@@ -2,6 +2,7 @@
 
 Module containing the entry point for all models supported by the Assistant.
 """
+import functools
 import logging
 
 from langchain.chat_models.openai import ChatOpenAI
@@ -23,7 +24,8 @@ def openai() -> ChatOpenAI:
     """Create a LangChain OpenAI chat model instance.
     
     Wrapper function to create an instance of the ChatOpenAI model
-    to be used for conversation.
+    to be used for conversation. The same instance is returned for as
+    long as the configuration is unchanged.
 
     Global configuration values required are:
         openai:
@@ -49,8 +51,18 @@ def openai() -> ChatOpenAI:
     openai_model = openai_config.get('model', 'gpt-3.5-turbo-0613')
     openai_temp = float(openai_config.get('temperature', '0'))
 
+    return _chat_openai(openai_model, openai_temp, openai_token)
+
+
+@functools.lru_cache(maxsize=4)
+def _chat_openai(model_name: str, temperature: float, token: str) -> ChatOpenAI:
+    """Create a ChatOpenAI instance, shared by all callers with the same settings.
+
+    Reusing the instance reuses its underlying API client and connections
+    rather than establishing new ones for every conversation.
+    """
     return ChatOpenAI(
-        model_name = openai_model,
-        temperature = openai_temp,
-        openai_api_key = openai_token,
+        model_name = model_name,
+        temperature = temperature,
+        openai_api_key = token,
     )
\ No newline at end of file
@@ -1,7 +1,10 @@
 import openai
-import json
-import logging
+import orjson
+import asyncio
 import copy
+import hashlib
+import logging
+from collections import OrderedDict
 
 import config
 import models.model as model
@@ -10,6 +13,18 @@ logger = logging.getLogger(__name__)
 """Configure the default logger for the module."""
 
 
+_RESPONSE_CACHE_SIZE = 128
+"""Maximum number of responses held within _response_cache."""
+
+
+_BATCH_CONCURRENCY = 5
+"""Default number of concurrent API requests made by run_prompts_batch()."""
+
+
+_response_cache = OrderedDict()
+"""Least recently used cache of deterministic (temperature 0) responses."""
+
+
 class OpenaiGPT(model.Model):
     """Integration to the OpenAI GPT-3.5-Turbo LLM API
     
@@ -31,66 +46,114 @@ class OpenaiGPT(model.Model):
         of the Assistants configuration.
         """
         try:
-            openai.api_key = config.get_value('openai.token')
+            openai_config = config.get_value('openai')
         except ValueError:
+            openai_config = {}
+
+        openai.api_key = openai_config.get('token', None)
+        if openai.api_key is None:
             logger.error('OpenAI API token required!')
 
-        try:
-            model.Model.model_name = config.get_value('openai.model')
-        except ValueError:
-            # Set a default model.
-            model.Model.model_name = 'gpt-3.5-turbo-0613'
+        # The model and temperature are optional, with defaults.
+        self.model_name = openai_config.get('model', 'gpt-3.5-turbo-0613')
+        self.temperature = float(openai_config.get('temperature', '0'))
 
 
-    def run_prompt(self, prompts: list, functions: list = None) -> dict:
-        """Execute a conversation with the OpenAI GPT LLM.
-        
-        Interface with the OpenAI GPT API.
+    def _prepare_request(self, prompts: list, functions: list) -> tuple:
+        """Prepare the arguments for a chat completion API request.
 
         Parameters
         ----------
         prompts
             List of conversational messages to prompt the LLM.
         functions
-            List of function definitions that the LLM can call. If None are
-            provided then function calling is disabled.
+            List of function definitions that the LLM can call, or None.
 
         Returns
-        dict
-            Response in alignment with model.Model.run_prompt dictonary.
+        -------
+        tuple
+            Keyword arguments for the API request and the response cache
+            key (None if the response is not to be cached).
         """
-        gpt_prompts = copy.deepcopy(prompts)
-        for p in gpt_prompts:
-            if 'function_call' in p:
-                p['function_call']['arguments'] = json.dumps(p['function_call']['arguments'])
-
-        if logger.isEnabledFor(logging.DEBUG):
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
             logger.debug(
                 'Sending %i prompts to %s',
-                len(gpt_prompts),
-                model.Model.model_name
+                len(prompts),
+                self.model_name
             )
-            for prompt in gpt_prompts:
+
+        # Prompt messages are JSON derived dicts which are never modified
+        # once created, so only messages with function call arguments to
+        # be encoded are copied, all others are shared.
+        gpt_prompts = []
+        for prompt in prompts:
+            if 'function_call' in prompt:
+                prompt = {
+                    **prompt,
+                    'function_call': {
+                        **prompt['function_call'],
+                        'arguments': orjson.dumps(prompt['function_call']['arguments']).decode(),
+                    },
+                }
+            gpt_prompts.append(prompt)
+            if debug:
                 logger.debug('\t=> %s', prompt)
 
-        if functions is None:
-            api_response = openai.ChatCompletion.create(
-                model=model.Model.model_name,
-                messages=gpt_prompts,
-            )
-        else:
-            if logger.isEnabledFor(logging.DEBUG):
+        api_args = {
+            'model': self.model_name,
+            'messages': gpt_prompts,
+            'temperature': self.temperature,
+        }
+        if functions is not None:
+            if debug:
                 logger.debug('Sending %i callback functions:', len(functions))
                 for func in functions:
                     logger.debug('\t=> %s', func['name'])
 
-            api_response = openai.ChatCompletion.create(
-                model=model.Model.model_name,
-                messages=gpt_prompts,
-                functions=functions,
-                function_call="auto",
-            )
+            api_args['functions'] = functions
+            api_args['function_call'] = 'auto'
 
+        cache_key = None
+        if self.temperature == 0:
+            cache_key = hashlib.sha256(orjson.dumps(
+                {
+                    'model': self.model_name,
+                    'messages': gpt_prompts,
+                    'functions': functions,
+                    'temperature': self.temperature,
+                },
+                option=orjson.OPT_SORT_KEYS,
+            )).hexdigest()
+
+        return api_args, cache_key
+
+
+    def _cached_response(self, cache_key: str) -> dict:
+        """Return a copy of a cached response, or None if not cached."""
+        if cache_key is None or cache_key not in _response_cache:
+            return None
+
+        logger.debug('Using cached response %s', cache_key)
+        _response_cache.move_to_end(cache_key)
+        return copy.deepcopy(_response_cache[cache_key])
+
+
+    def _process_response(self, api_response: dict, cache_key: str) -> dict:
+        """Convert a chat completion API response into a prompt response.
+
+        Parameters
+        ----------
+        api_response
+            Response returned by the chat completion API.
+        cache_key
+            Key to cache the response under, or None to not cache it.
+
+        Returns
+        -------
+        dict
+            Response in alignment with model.Model.run_prompt dictonary.
+        """
         # Report API usage if it is provided
         if 'usage' in api_response.keys():
             logger.info(
@@ -112,8 +175,108 @@ class OpenaiGPT(model.Model):
         if ( prompt_response['message'].get('function_call')
                 and prompt_response['message']['function_call'].get('arguments') ):
 
-            prompt_response['message']['function_call']['arguments'] = json.loads(
+            prompt_response['message']['function_call']['arguments'] = orjson.loads(
                 prompt_response['message']['function_call']['arguments']
             )
 
+        if cache_key is not None:
+            _response_cache[cache_key] = copy.deepcopy(prompt_response)
+            if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
         return prompt_response
+
+
+    def run_prompt(self, prompts: list, functions: list = None) -> dict:
+        """Execute a conversation with the OpenAI GPT LLM.
+        
+        Interface with the OpenAI GPT API. When the temperature is 0 the
+        response is deterministic, so responses are cached and an identical
+        request is answered from the cache rather than the API.
+
+        Parameters
+        ----------
+        prompts
+            List of conversational messages to prompt the LLM.
+        functions
+            List of function definitions that the LLM can call. If None are
+            provided then function calling is disabled.
+
+        Returns
+        dict
+            Response in alignment with model.Model.run_prompt dictonary.
+        """
+        api_args, cache_key = self._prepare_request(prompts, functions)
+
+        prompt_response = self._cached_response(cache_key)
+        if prompt_response is not None:
+            return prompt_response
+
+        api_response = openai.ChatCompletion.create(**api_args)
+        return self._process_response(api_response, cache_key)
+
+
+    async def arun_prompt(self, prompts: list, functions: list = None) -> dict:
+        """Execute a conversation with the OpenAI GPT LLM asynchronously.
+
+        The asynchronous equivalent of run_prompt(), allowing the API
+        request to be awaited alongside other work.
+
+        Parameters
+        ----------
+        prompts
+            List of conversational messages to prompt the LLM.
+        functions
+            List of function definitions that the LLM can call. If None are
+            provided then function calling is disabled.
+
+        Returns
+        dict
+            Response in alignment with model.Model.run_prompt dictonary.
+        """
+        api_args, cache_key = self._prepare_request(prompts, functions)
+
+        prompt_response = self._cached_response(cache_key)
+        if prompt_response is not None:
+            return prompt_response
+
+        api_response = await openai.ChatCompletion.acreate(**api_args)
+        return self._process_response(api_response, cache_key)
+
+
+    async def run_prompts_batch(
+            self,
+            prompt_lists: list,
+            functions: list = None,
+            max_concurrency: int = _BATCH_CONCURRENCY,
+        ) -> list:
+        """Execute a batch of independent conversations concurrently.
+
+        Each list of prompts is sent as a separate API request, with the
+        requests made concurrently but limited to max_concurrency requests
+        in flight at any time to stay within the API rate limits.
+
+        Parameters
+        ----------
+        prompt_lists
+            List of independent lists of conversational messages.
+        functions
+            List of function definitions that the LLM can call. If None are
+            provided then function calling is disabled.
+        max_concurrency
+            Maximum number of concurrent API requests.
+
+        Returns
+        -------
+        list
+            Responses for each list of prompts, in the same order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_limited(prompts: list) -> dict:
+            async with semaphore:
+                return await self.arun_prompt(prompts, functions)
+
+        return await asyncio.gather(*[
+            run_limited(prompts) for prompts in prompt_lists
+        ])
@@ -33,23 +33,32 @@ _probe_index = [
     { 'name': 'database', 'list_func': Database.tool_list },
 ]
 
+# Tool lists already generated, keyed by the requested probe name.
+_tool_cache = {}
+
 def tool_list(probe_name: str = None) -> list:
 
+    # The probes tools are static, so only create them once per process.
+    if probe_name in _tool_cache:
+        return list(_tool_cache[probe_name])
+
     tools = [
         probe['list_func']()
         for probe in _probe_index
         if probe['name'] == probe_name or probe_name is None
     ]
 
-    # Conver the list of lists into a singls list
-    tools = sum(tools, [])
+    # Conver the list of lists into a singls list, ordered by name so that
+    # the tools are always described to the LLM in the same order.
+    tools = sorted(sum(tools, []), key=lambda tool: tool.name)
+    _tool_cache[probe_name] = tools
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug('Tool List ==>')
         for tool in tools:
             logger.debug(tool)
 
-    return tools
+    return list(tools)
 
 
 
@@ -134,27 +143,45 @@ class ProbeController:
         ----------
         None
         """
+        self.refresh_functions()
+
+
+    def refresh_functions(self) -> None:
+        """Recollect the functions provided by all registered probes.
+
+        The function_index and the list returned by function_list() are
+        only generated when the controller is initialised, this needs to be
+        called if a probe changes the functions it provides.
+        """
+        self._function_index = []
+        self._functions = []
+        self._probes_by_name = {}
+        self._functions_by_name = {}
         for probe in self._probe_index:
-            for probe_func in probe['list_function']():
-                self._function_index.append({'probe': probe['name'], 'function': probe_func})
+            self._probes_by_name.setdefault(probe['name'], probe)
+            probe_functions = probe['list_function']()
+            for probe_func in probe_functions:
+                func = {'probe': probe['name'], 'function': probe_func}
+                self._function_index.append(func)
+                # the first instance of a function name is the one called
+                self._functions_by_name.setdefault(probe_func['name'], func)
+            self._functions = self._functions + probe_functions
 
 
-    # Search the probe_index for the requested probe name and return its
-    # definition
+    # Lookup the requested probe name and return its definition
     def _get_probe(self, name: str) -> dict:
-        for probe in self._probe_index:
-            if probe['name'] == name:
-                return probe
-        raise ProbeNotFoundError(name)
+        try:
+            return self._probes_by_name[name]
+        except KeyError:
+            raise ProbeNotFoundError(name) from None
 
 
-    # Search the function_index for the requested function and return its
-    # definition
+    # Lookup the requested function and return its definition
     def _get_function(self, name: str) -> dict:
-        for func in self._function_index:
-            if func['function']['name'] == name:
-                return func
-        raise FunctionNotFoundError(name)
+        try:
+            return self._functions_by_name[name]
+        except KeyError:
+            raise FunctionNotFoundError(name) from None
 
 
     def function_list(self) -> list:
@@ -162,7 +189,8 @@ class ProbeController:
 
         For each probe that has been registered within the probe_index
         list, generate a list of function definitions which can be
-        used reference by the Assistant.
+        used reference by the Assistant. The list is collected when the
+        controller is initialised, see refresh_functions().
 
         Parameters
         ----------
@@ -173,16 +201,13 @@ class ProbeController:
         list
             List of dict for all functions provided by all probes
         """
-        return_list = []
-        for probe in self._probe_index:
-            return_list = return_list + probe['list_function']()
-        return return_list
+        return list(self._functions)
 
 
     def function_call(self, function_name: str, function_args: dict) -> str:
         """Execute the provided probe function and return the result.
 
-        The function_name provided is used to search the function_index
+        The function_name provided is used to lookup the function_index
         for a corresponding probe function to call. It is expected that
         the function name is unique across all probes, however the first
         instance of the function name found will be called.
@@ -211,11 +236,10 @@ class ProbeController:
             probe = self._get_probe(probe_function['probe'])
 
             logger.debug(
-                'Calling {0}.{1}():\n{2}'.format(
-                    probe['name'],
-                    function_name,
-                    function_args,
-                )
+                'Calling %s.%s():\n%s',
+                probe['name'],
+                function_name,
+                function_args,
             )
             
             # Call the probe to execute function(args)
@@ -225,20 +249,13 @@ class ProbeController:
             )
 
             logger.debug(
-                'Function result: {0}.{1}()\n{2}'.format(
-                    probe['name'],
-                    probe_function['function']['name'],
-                    probe_result,
-                )       
+                'Function result: %s.%s()\n%s',
+                probe['name'],
+                probe_function['function']['name'],
+                probe_result,
             )
             return probe_result
         
-        except FunctionNotFoundError as err:
-            # need to do something better than printing to the console
-            print(err)
-            return None
-
-        except ProbeNotFoundError as err:
-            # need to do something better than printing to the console
-            print(err)
+        except (FunctionNotFoundError, ProbeNotFoundError) as err:
+            logger.warning('%s', err.msg)
             return None
@@ -13,12 +13,19 @@ function.
 
 Note
 ----
-    We are currently only returning staic data, work still needs to be
-    done here to make realtime API calls out into the environmet.    
+    The database servers and databases are static data. Only the health
+    check reaches out into the environment, by connecting to the service
+    port of the database's server.
 """
+import asyncio
+import concurrent.futures
+import csv
+import io
 import logging
+import socket
+import time
 
-from random import randrange
+from collections import namedtuple
 
 from langchain.tools import BaseTool
 
@@ -34,10 +41,229 @@ _db_keys = [
 ]
 
 
+# Default service port for each of the accepted database types
+_db_ports = {
+    'mysql': 3306,
+    'postgresql': 5432,
+    'mongodb': 27017,
+}
+
+
+# Seconds a health check is allowed to take, and the seconds its result is
+# reused for repeated checks of the same database.
+_HEALTH_TIMEOUT = 2.0
+_HEALTH_TTL = 10.0
+
+
+# Recent health check results, keyed by lowercase database name with
+# values of (expiry time, result).
+_health_cache = {}
+
+
+# Threads to resolve hostnames for the blocking health check, as
+# socket.getaddrinfo() can't be given a timeout itself.
+_resolver = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+# Health check results, shared by every check rather than created per call.
+_HEALTHY = 'Healthy'
+_FAILED = 'Failed'
+
+
 def _unknown_db_type(key: str) -> str:
     return f'The provided database type {key} is not valid.'
 
 
+# Records of the static database server and database details
+Server = namedtuple('Server', 'name type hostname')
+Database = namedtuple('Database', 'name type server')
+
+
+# Static database server details
+_servers = (
+    Server('sr-dbs01', 'MySQL', 'sr-dbs01.core.lennoxconsulting.com.au'),
+    Server('sr-dbs02', 'MongoDB', 'sr-dbs02.core.lennoxconsulting.com.au'),
+    Server('sr-dbs03', 'PostgreSQL', 'sr-dbs03.core.lennoxconsulting.com.au'),
+    Server('sr-dbs04', 'MySQL', 'sr-dbs04.lab.lennoxconsulting.com.au'),
+    Server('sr-dbs04', 'PostgreSQL', 'sr-dbs04.lab.lennoxconsulting.com.au'),
+)
+
+# Static database details
+_databases = (
+    Database('netbox', 'PostgreSQL', 'sr-dbs03'),
+    Database('netbox-test', 'PostgreSQL', 'sr-dbs04'),
+    Database('netbox-dev', 'PostgreSQL', 'sr-dbs04'),
+    Database('taiga', 'MySQL', 'sr-dbs01'),
+    Database('homeassistant', 'MySQL', 'sr-dbs01'),
+    Database('wordpress', 'MySQL', 'sr-dbs01'),
+    Database('wordpress-dev', 'MySQL', 'sr-dbs04'),
+    Database('unifi', 'PostgreSQL', 'sr-dbs04'),
+    Database('unifi-test', 'PostgreSQL', 'sr-dbs04'),
+    Database('race-sim', 'MongoDB', 'sr-dbs02'),
+    Database('race-sim-test', 'MongoDB', 'sr-dbs02'),
+    Database('race-sim-dev', 'MongoDB', 'sr-dbs02'),
+)
+
+
+def _index_servers(servers: tuple) -> tuple:
+    """Index the server details by database type.
+
+    Returns
+    -------
+    tuple
+        List of all servers and a dict of the servers indexed by
+        (lowercase) database type.
+    """
+    rows = list(servers)
+    rows_by_type = {}
+    for server in servers:
+        rows_by_type.setdefault(server.type.lower(), []).append(server)
+    return rows, rows_by_type
+
+
+def _index_databases(databases: tuple) -> dict:
+    """Index the database details by server and database type.
+
+    Returns
+    -------
+    dict
+        Lists of databases indexed by (lowercase) (server name, database
+        type), where a '' server name or database type matches any.
+    """
+    rows = {}
+    for db in databases:
+        server = db.server.lower()
+        db_type = db.type.lower()
+        for key in (('', ''), (server, ''), ('', db_type), (server, db_type)):
+            rows.setdefault(key, []).append(db)
+    return rows
+
+
+def _tool_description(text: str) -> str:
+    """Normalise a Tool description into a single line of text.
+
+    Tool descriptions are included within the prompts sent to the LLM, so
+    all whitespace is normalised to keep them byte identical.
+    """
+    return " ".join(text.split())
+
+
+def _render_csv(header: tuple, rows: list) -> str:
+    """Render CSV output from a header and a list of rows.
+
+    The csv module takes care of quoting any field values containing
+    commas or quotes.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+_server_rows, _server_rows_by_type = _index_servers(_servers)
+_database_rows = _index_databases(_databases)
+
+
+# The static data allows the CSV output for every valid filter value to be
+# rendered up front. Server output is keyed by database type ('' for all)
+# and database output by (server name, database type).
+_servers_header = ('Server Name', 'Database Type', 'Hostname')
+_servers_csv = {
+    db_type: _render_csv(_servers_header, _server_rows_by_type.get(db_type, []))
+    for db_type in _db_keys
+}
+_servers_csv[''] = _render_csv(_servers_header, _server_rows)
+
+_databases_header = ('Database Name', 'Database Type', 'Database Server')
+_databases_csv = {
+    key: _render_csv(_databases_header, rows)
+    for key, rows in _database_rows.items()
+}
+_databases_csv_empty = _render_csv(_databases_header, [])
+
+
+# Databases indexed by lowercase name, and server hostnames indexed by
+# lowercase (server name, database type).
+_databases_by_name = {db.name.lower(): db for db in _databases}
+_server_hosts = {
+    (server.name.lower(), server.type.lower()): server.hostname
+    for server in _servers
+}
+
+
+def _health_check_target(db_name: str) -> tuple:
+    """Find the address to connect to when health checking a database.
+
+    Parameters
+    ----------
+    db_name
+        The name of the database to be assessed.
+
+    Returns
+    -------
+    tuple
+        The health cache key, the result if no connection check is
+        required (cached, unknown database or server) otherwise None, and
+        the (hostname, port) address of the database server.
+    """
+    db_name = db_name or ''
+    key = db_name.lower()
+
+    cached = _health_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return key, cached[1], None
+
+    db = _databases_by_name.get(key)
+    if db is None:
+        return key, f'The database {db_name} is not known.', None
+
+    db_type = db.type.lower()
+    hostname = _server_hosts.get((db.server.lower(), db_type))
+    if hostname is None:
+        logger.warning('No hostname known for database server %s', db.server)
+        return key, _FAILED, None
+
+    return key, None, (hostname, _db_ports[db_type])
+
+
+def _connect(address: tuple, timeout: float) -> None:
+    """Connect to the address, with the whole attempt limited to timeout.
+
+    Unlike socket.create_connection(), the hostname resolution is included
+    within the time limit, and the time limit covers all of the addresses
+    the hostname resolves to rather than applying to each in turn.
+
+    Raises
+    ------
+    OSError
+        The connection could not be made within the time limit.
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        addrinfo = _resolver.submit(
+            socket.getaddrinfo,
+            *address,
+            type = socket.SOCK_STREAM,
+        ).result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        raise TimeoutError(f'Resolving {address[0]} timed out') from None
+
+    error = TimeoutError(f'Connecting to {address[0]} timed out')
+    for family, sock_type, proto, _, sock_addr in addrinfo:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        with socket.socket(family, sock_type, proto) as sock:
+            sock.settimeout(remaining)
+            try:
+                sock.connect(sock_addr)
+                return
+            except OSError as err:
+                error = err
+    raise error
+
+
 def tool_list() -> list:
     """Provide a list of all the tools implemented by the database probe.
 
@@ -60,12 +286,13 @@ def tool_list() -> list:
 class ListServers(BaseTool):
     """Agent Tool to provide a list of database servers."""
     name = 'Database - List Database Servers'
-    description = \
-        'Use this tool when you need to obtain a list of database server names. ' \
-        'If a database type is provided only servers linked to that type will be provided. ' \
-        'Accepted database types are ["MySQL", "MongoDB", "PostgreSQL"]. ' \
-        'The list of servers will be returned as CSV data with the following columns: ' \
-        '["Server Name", "Database Type", "Hostname"]'
+    description = _tool_description("""
+        Use this tool when you need to obtain a list of database server names.
+        If a database type is provided only servers linked to that type will be provided.
+        Accepted database types are ["MySQL", "MongoDB", "PostgreSQL"].
+        The list of servers will be returned as CSV data with the following columns:
+        ["Server Name", "Database Type", "Hostname"]
+    """)
 
     def _run(self, db_type: str = '') -> str:
         """Provide a list of database servers, filtered by type if required.
@@ -89,47 +316,30 @@ class ListServers(BaseTool):
         str
             String with CSV formatted data.
         """
-        global _db_keys
-
-        servers = [
-            {'name': 'sr-dbs01', 'type': 'MySQL', 'hostname': 'sr-dbs01.core.lennoxconsulting.com.au'},
-            {'name': 'sr-dbs02', 'type': 'MongoDB', 'hostname': 'sr-dbs02.core.lennoxconsulting.com.au'},
-            {'name': 'sr-dbs03', 'type': 'PostgreSQL', 'hostname': 'sr-dbs03.core.lennoxconsulting.com.au'},
-            {'name': 'sr-dbs04', 'type': 'MySQL', 'hostname': 'sr-dbs04.lab.lennoxconsulting.com.au'},
-            {'name': 'sr-dbs04', 'type': 'PostgreSQL', 'hostname': 'sr-dbs04.lab.lennoxconsulting.com.au'},
-        ]
-
         # Input data cleanup
-        if db_type is None:
-            db_type = ''
-        db_type = db_type.lower()
+        db_type = (db_type or '').lower()
 
-        # Validate the db_type value the LLM has provided us
-        if db_type != '' and db_type not in _db_keys:
+        # Output is precomputed for every valid db_type the LLM can provide
+        output = _servers_csv.get(db_type)
+        if output is None:
             return _unknown_db_type(db_type)
-        
-        # Initialise output with CSV header
-        output = "Server Name,Database Type,Hostname\n"
-        for server in servers:
-            if (db_type == '' or db_type == server['type']):
-                output = output + f"{server['name']},{server['type']},{server['hostname']}\n"
-
-        return output        
+        return output
 
-    def _arun(self, db_type: str = '') -> str:
-        raise NotImplementedError("This tool does not support async")
+    async def _arun(self, db_type: str = '') -> str:
+        return self._run(db_type)
     
 
 class ListDatabases(BaseTool):
     """Agent Tool to provide a list of databases."""
     name = 'Database - List Databases'
-    description = \
-        'Use this tool when you need to obtain a list of databases. ' \
-        'If a [db_server] is provided then only database associated with that database server will be provided. ' \
-        'If a [db_type] is provided then only databases of that type will be provided. ' \
-        'Accepted database types are ["MySQL", "MongoDB", "PostgreSQL"]. ' \
-        'The list of servers will be returned as CSV data with the following columns: ' \
-        '["Database Name", "Database Type", "Database Server"]'
+    description = _tool_description("""
+        Use this tool when you need to obtain a list of databases.
+        If a [db_server] is provided then only database associated with that database server will be provided.
+        If a [db_type] is provided then only databases of that type will be provided.
+        Accepted database types are ["MySQL", "MongoDB", "PostgreSQL"].
+        The list of servers will be returned as CSV data with the following columns:
+        ["Database Name", "Database Type", "Database Server"]
+    """)
 
     def _run(self, db_server: str = '', db_type: str = '') -> str:
         """Provide a list of databases, filtered by type/server if required.
@@ -155,61 +365,37 @@ class ListDatabases(BaseTool):
         str
             String with CSV formatted data.
         """
-        global _db_keys
-        
-        databases = [
-            {'name': 'netbox', 'type': 'PostgreSQL', 'server': 'sr-dbs03'},
-            {'name': 'netbox-test', 'type': 'PostgreSQL', 'server': 'sr-dbs04'},
-            {'name': 'netbox-dev', 'type': 'PostgreSQL', 'server': 'sr-dbs04'},
-            {'name': 'taiga', 'type': 'MySQL', 'server': 'sr-dbs01'},
-            {'name': 'homeassistant', 'type': 'MySQL', 'server': 'sr-dbs01'},
-            {'name': 'wordpress', 'type': 'MySQL', 'server': 'sr-dbs01'},
-            {'name': 'wordpress-dev', 'type': 'MySQL', 'server': 'sr-dbs04'},
-            {'name': 'unifi', 'type': 'PostgreSQL', 'server': 'sr-dbs04'},
-            {'name': 'unifi-test', 'type': 'PostgreSQL', 'server': 'sr-dbs04'},
-            {'name': 'race-sim', 'type': 'MongoDB', 'server': 'sr-dbs02'},
-            {'name': 'race-sim-test', 'type': 'MongoDB', 'server': 'sr-dbs02'},
-            {'name': 'race-sim-dev', 'type': 'MongoDB', 'server': 'sr-dbs02'},
-        ]
-
         # Input data cleanup
-        if db_server is None:
-            db_server = ''
-        db_server = db_server.lower()
-        if db_type is None:
-            db_type = ''
-        db_type = db_type.lower()
+        db_server = (db_server or '').lower()
+        db_type = (db_type or '').lower()
 
         # Validate the db_type value the LLM has provided us
         if db_type != '' and db_type not in _db_keys:
             return _unknown_db_type(db_type)
         
-        # Initialise output with CSV header.
-        output = "Database Name,Database Type,Database Server\n"
-        for db in databases:
-            if ((db_type == '' or db_type == db['type'].lower())
-                and (db_server == '' or db_server == db['server'].lower())):
-                output = output + f"{db['name']},{db['type']},{db['server']}\n"
-        return output
+        return _databases_csv.get((db_server, db_type), _databases_csv_empty)
     
 
-    def _arun(self, db_server: str = '', db_type: str = '') -> str:
-        raise NotImplementedError("This tool does not support async")
+    async def _arun(self, db_server: str = '', db_type: str = '') -> str:
+        return self._run(db_server, db_type)
 
 
 class HealthCheck(BaseTool):
     """Agent Tool to provide an assessment on a databases operational health."""
     name = 'Database - Health Check'
-    description = \
-        'Use this tool when you need to obtain the operational health of a database. ' \
-        'The name of a known database must be provided upon which the health check will be performed. ' \
+    description = _tool_description("""
+        Use this tool when you need to obtain the operational health of a database.
+        The name of a known database must be provided upon which the health check will be performed.
+    """)
 
 
     def _run(self, db_name: str) -> str:
         """Perform a health check assessment on a database.
         
-        What constitues a health check needs to be worked out. For now
-        a random result is returned to provide some variance in testing.
+        What constitues a health check still needs to be worked out. For
+        now the database is considered healthy if a connection can be
+        made to its database server's service port within the time limit.
+        Results are reused for repeated checks within a short time.
 
         Parameters
         ----------
@@ -221,8 +407,43 @@ class HealthCheck(BaseTool):
         str
             Resulting health assessment.
         """
-        return "Failed" if randrange(1, 3) == 1 else "Healthy"
+        key, result, address = _health_check_target(db_name)
+        if result is not None:
+            return result
+
+        try:
+            _connect(address, _HEALTH_TIMEOUT)
+            result = _HEALTHY
+        except OSError as err:
+            logger.info('Health check of %s on %s failed: %s', db_name, address[0], err)
+            result = _FAILED
+
+        _health_cache[key] = (time.monotonic() + _HEALTH_TTL, result)
+        return result
     
 
-    def _arun(self, db_name: str) -> str:
-        raise NotImplementedError("This tool does not support async")
\ No newline at end of file
+    async def _arun(self, db_name: str) -> str:
+        key, result, address = _health_check_target(db_name)
+        if result is not None:
+            return result
+
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(*address),
+                timeout = _HEALTH_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            logger.info('Health check of %s on %s failed: %s', db_name, address[0], err)
+            result = _FAILED
+        else:
+            # The connection was made, so failing to close it cleanly
+            # doesn't change the result.
+            result = _HEALTHY
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        _health_cache[key] = (time.monotonic() + _HEALTH_TTL, result)
+        return result